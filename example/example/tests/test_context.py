@@ -0,0 +1,116 @@
+from django.template import Context, NodeList, Template, TemplateSyntaxError
+from django.test import SimpleTestCase
+
+from django_reactive_framework.core.base import ReactContext, ReactNode, ReactVar, is_pure_text_nodelist, reactcontext_str
+from django_reactive_framework.core.expressions.implementations import IntExpression
+
+class ReactContextTest(SimpleTestCase):
+
+    def setUp(self):
+        self.root = ReactContext('root')
+        self.child = ReactContext('child', self.root)
+        self.grandchild = ReactContext('grandchild', self.child)
+
+    def test_search_var(self):
+        """Test that vars are found through the ancestors, also when added after a previous lookup"""
+
+        root_var = ReactVar('a', IntExpression(1))
+        self.root.add_var(root_var)
+
+        self.assertIs(self.grandchild.search_var('a'), root_var)
+        self.assertIsNone(self.grandchild.search_var('b'))
+
+        child_var = ReactVar('a', IntExpression(2))
+        self.child.add_var(child_var)
+        other_var = ReactVar('b', IntExpression(3))
+        self.root.add_var(other_var)
+
+        self.assertIs(self.grandchild.search_var('a'), child_var)
+        self.assertIs(self.grandchild.search_var('b'), other_var)
+
+    def test_add_var_twice(self):
+        """Test that redefining a variable in the same context raises, also for the very same var"""
+
+        var = ReactVar('a', IntExpression(1))
+        self.root.add_var(var)
+
+        with self.assertRaises(TemplateSyntaxError):
+            self.root.add_var(ReactVar('a', IntExpression(2)))
+
+        with self.assertRaises(TemplateSyntaxError):
+            self.root.add_var(var)
+
+    def test_vars_needed_decleration(self):
+        """Test that the declared vars are in pre-order, and that each call returns a new list"""
+
+        vars = [ReactVar(name, IntExpression(0)) for name in ('a', 'b', 'c')]
+        self.grandchild.add_var(vars[2])
+        self.root.add_var(vars[0])
+        self.child.add_var(vars[1])
+
+        result = self.root.vars_needed_decleration()
+        self.assertEqual(result, vars)
+
+        result.clear()
+        self.assertEqual(self.root.vars_needed_decleration(), vars)
+
+    def test_clear_render(self):
+        """Test that clearing a context resets it and its subtree, but not its ancestors"""
+
+        self.root.add_var(ReactVar('a', IntExpression(1)))
+        self.child.compute_initial = True
+        self.grandchild.add_var(ReactVar('b', IntExpression(2)))
+
+        self.child.clear_render()
+
+        self.assertIsNotNone(self.root.search_var('a'))
+        self.assertEqual(self.child.vars, {})
+        self.assertFalse(self.child.compute_initial)
+        self.assertEqual(self.grandchild.vars, {})
+
+        # The cleared contexts are usable again
+        var = ReactVar('b', IntExpression(3))
+        self.grandchild.add_var(var)
+        self.assertIs(self.grandchild.search_var('b'), var)
+
+class ReducedSubtreeTest(SimpleTestCase):
+
+    def test_text_is_coalesced(self):
+        """Test that subsequent texts, also from non-reactive nodes, are joined into single elements"""
+
+        template = Template('{% load reactive %}' + \
+            '{% #block %}a{{ x }}b{% if True %}c{% #/print 1 %}d{% endif %}e{% /block %}')
+        node = next(node for node in template.nodelist if isinstance(node, ReactNode))
+
+        template_context = Context({'x': 'X'})
+        with template_context.render_context.push_state(template):
+            react_context = node.make_context(None, template_context)
+            template_context[reactcontext_str] = react_context
+
+            subtree = react_context.generate_reduced_subtree(node.nodelist, template_context)
+
+        self.assertEqual(len(subtree), 3)
+        self.assertEqual(subtree[0], 'aXbc')
+        self.assertIsInstance(subtree[1], tuple)
+        self.assertEqual(subtree[2], 'de')
+
+    def test_pure_text(self):
+        """Test that a nodelist without reactive nodes is reduced to a single text"""
+
+        template = Template('{% load reactive %}{% #block %}a{{ x }}b{% /block %}')
+        node = next(node for node in template.nodelist if isinstance(node, ReactNode))
+
+        template_context = Context({'x': 'X'})
+        react_context = node.make_context(None, template_context)
+
+        self.assertEqual(react_context.generate_reduced_subtree(node.nodelist, template_context), ['aXb'])
+
+    def test_is_pure_text_nodelist(self):
+        """Test detecting pure text nodelists, also for nodelists which weren't built by Django's parser"""
+
+        self.assertTrue(is_pure_text_nodelist(Template('a').nodelist))
+        self.assertFalse(is_pure_text_nodelist(Template('a{{ b }}').nodelist))
+
+        hand_built = NodeList(Template('a{{ b }}').nodelist)
+        self.assertFalse(hand_built.contains_nontext)
+        self.assertFalse(is_pure_text_nodelist(hand_built))
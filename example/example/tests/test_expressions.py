@@ -0,0 +1,141 @@
+from django import template
+from django.test import SimpleTestCase
+
+from django_reactive_framework.core.base import value_to_expression
+from django_reactive_framework.core.expressions.implementations import parse_expression, \
+    ArrayExpression, BinaryOperatorExpression, BoolExpression, IntExpression, StringExpression, TernaryOperatorExpression
+
+class IntExpressionTest(SimpleTestCase):
+
+    def test_try_parse(self):
+        """Test parsing int literals"""
+
+        self.assertEqual(IntExpression.try_parse('12').val, 12)
+        self.assertEqual(IntExpression.try_parse('-12').val, -12)
+        self.assertIsNone(IntExpression.try_parse('1.5'))
+        self.assertIsNone(IntExpression.try_parse('abc'))
+
+    def test_try_parse_too_long(self):
+        """Test that a digit literal over the int string conversion limit isn't parsed as int"""
+
+        self.assertIsNone(IntExpression.try_parse('9' * 5000))
+
+class TernaryExpressionTest(SimpleTestCase):
+
+    def test_constant_condition_is_folded(self):
+        """Test that a ternary with a constant boolean condition is replaced by the chosen branch"""
+
+        expression = parse_expression("true ? 'a' : 'b'")
+        self.assertIsInstance(expression, StringExpression)
+        self.assertEqual(expression.val, 'a')
+
+        expression = parse_expression("false ? 'a' : 'b'")
+        self.assertIsInstance(expression, StringExpression)
+        self.assertEqual(expression.val, 'b')
+
+    def test_non_boolean_constant_condition(self):
+        """Test that a non boolean constant condition is parsed, and fails only on evaluation"""
+
+        expression = parse_expression("1 ? 'a' : 'b'")
+        self.assertIsInstance(expression, TernaryOperatorExpression)
+        self.assertFalse(expression.constant)
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            expression.eval_initial(None)
+
+class BinaryOperatorExpressionTest(SimpleTestCase):
+
+    def test_constant_is_folded(self):
+        """Test that constant operators are replaced by the literal of their value"""
+
+        expression = parse_expression('1 + 2 * 3')
+        self.assertIsInstance(expression, IntExpression)
+        self.assertEqual(expression.val, 7)
+
+        expression = parse_expression("'a' + 1")
+        self.assertIsInstance(expression, StringExpression)
+        self.assertEqual(expression.val, 'a1')
+
+    def test_reduce_folds(self):
+        """Test that reduce folds the operator once all the template variables are substituted"""
+
+        expression = parse_expression('x + 1')
+        self.assertIsInstance(expression, BinaryOperatorExpression)
+
+        reduced = expression.reduce(template.Context({'x': 2}))
+        self.assertIsInstance(reduced, IntExpression)
+        self.assertEqual(reduced.val, 3)
+
+        # Nothing to substitute, so the very same expression is kept
+        self.assertIs(expression.reduce(template.Context({})), expression)
+
+    def test_fold_error_is_kept_for_evaluation(self):
+        """Test that a constant operator which fails to evaluate is parsed, and fails only on evaluation"""
+
+        expression = parse_expression("1 < 'a'")
+        self.assertIsInstance(expression, BinaryOperatorExpression)
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            expression.eval_initial(None)
+
+    def test_less_operator(self):
+        """Test that '<' evaluates to a boolean (it used to evaluate to None)"""
+
+        for source, expected in (('1 < 2', True), ('2 < 1', False), ('1 < 1', False)):
+            expression = parse_expression(source)
+            self.assertIsInstance(expression, BoolExpression)
+            self.assertIs(expression.eval_initial(None), expected)
+
+    def test_less_operator_after_reduce(self):
+        """Test that '<' over a template variable is evaluated once the variable is substituted"""
+
+        expression = parse_expression('x < 2')
+        self.assertFalse(expression.constant)
+
+        reduced = expression.reduce(template.Context({'x': 1}))
+        self.assertIs(reduced.eval_initial(None), True)
+        self.assertEqual(reduced.eval_js_and_hooks(None)[0], 'true')
+
+    def test_bool_operators_short_circuit(self):
+        """Test that '&&' and '||' don't evaluate the args after the deciding one"""
+
+        template_context = template.Context({'y': {}})
+
+        # Evaluating the missing key raises, so reaching it would fail the test
+        for source, x, expected in (('x && y.missing', False, False), ('x || y.missing', True, True)):
+            template_context['x'] = x
+            expression = parse_expression(source).reduce(template_context)
+            self.assertIs(expression.eval_initial(None), expected)
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            template_context['x'] = True
+            parse_expression('x && y.missing').reduce(template_context).eval_initial(None)
+
+class CompositeExpressionTest(SimpleTestCase):
+
+    def test_parse_is_shared(self):
+        """Test that parsing the same source twice gives the same expression"""
+
+        self.assertIs(parse_expression('x + 1'), parse_expression('x + 1'))
+
+    def test_constant_array(self):
+        """Test the constness and js of arrays built from values"""
+
+        expression = value_to_expression([1, 'a', [True, None]])
+        self.assertIsInstance(expression, ArrayExpression)
+        self.assertTrue(expression.constant)
+
+        js, hooks = expression.eval_js_and_hooks(None)
+        self.assertEqual(js, "[1,'a',[true,null]]")
+        self.assertFalse(hooks)
+        # The js of a constant expression is computed only once
+        self.assertIs(expression.eval_js_and_hooks(None)[0], js)
+
+        self.assertEqual(expression.eval_js_and_hooks(None, '"')[0], '[1,"a",[true,null]]')
+
+    def test_non_constant_array(self):
+        """Test that an array with a variable isn't constant"""
+
+        expression = parse_expression('[1, x]')
+        self.assertIsInstance(expression, ArrayExpression)
+        self.assertFalse(expression.constant)
@@ -0,0 +1,65 @@
+import json
+import re
+import shutil
+import subprocess
+
+from django.template import Context, Template
+from django.test import SimpleTestCase
+from unittest import skipUnless
+
+from django_reactive_framework.core.base import reactive_script
+
+two_blocks_template = """{% load reactive %}
+{% #block %}{% #/def a=1 %}{% #/print a %}{% /block %}
+{% #block %}{% #/def b='x' %}{% #element span %}{% #/print b+suffix %}{% /element %}{% /block %}
+"""
+
+# Runs the given script blocks in one shared global scope, like a browser does
+node_runner = """
+const vm = require('vm');
+const scripts = JSON.parse(require('fs').readFileSync(0, 'utf-8'));
+const elements = {};
+const context = vm.createContext({
+    document: {getElementById: (id) => (elements[id] = elements[id] || {innerHTML: ''})},
+});
+for (const script of scripts)
+    vm.runInContext(script, context);
+vm.runInContext("__reactive_data_set(b_block_1, 'y', [], undefined);", context);
+process.stdout.write(JSON.stringify(elements));
+"""
+
+class ToplevelScriptTest(SimpleTestCase):
+
+    def render_scripts(self):
+        output = Template(two_blocks_template).render(Context({'suffix': 'q'}))
+
+        return re.findall(r'<script>(.*?)</script>', output, re.DOTALL)
+
+    def test_script_emitted_per_block(self):
+        """Test that every toplevel reactive block carries its own copy of the reactive script"""
+
+        scripts = self.render_scripts()
+        self.assertEqual(len(scripts), 2)
+
+        for script in scripts:
+            self.assertIn(reactive_script, script)
+
+    def run_scripts(self, scripts):
+        result = subprocess.run(['node', '-e', node_runner], input=json.dumps(scripts),
+            capture_output=True, text=True, check=True)
+
+        return json.loads(result.stdout)
+
+    @skipUnless(shutil.which('node'), 'Node.js is needed for running the page JS')
+    def test_blocks_run(self):
+        """Test that the page JS of both blocks runs together"""
+
+        elements = self.run_scripts(self.render_scripts())
+        self.assertEqual(elements['react_html_element_block_1_element_0']['innerHTML'], 'yq')
+
+    @skipUnless(shutil.which('node'), 'Node.js is needed for running the page JS')
+    def test_block_runs_alone(self):
+        """Test that the JS of a block runs without the other blocks, like a cached fragment served alone"""
+
+        elements = self.run_scripts(self.render_scripts()[1:])
+        self.assertEqual(elements['react_html_element_block_1_element_0']['innerHTML'], 'yq')
@@ -0,0 +1,41 @@
+from django import template
+from django.test import SimpleTestCase
+
+from django_reactive_framework.core.utils import reduce_nodelist, split_kwargs
+
+class SplitKwargsTest(SimpleTestCase):
+
+    def test_split(self):
+        """Test splitting arguments with and without assignments"""
+
+        self.assertEqual(list(split_kwargs(['a', 'b="x=y"', 'c', '=', "'d'"])),
+            [('a', None), ('b', '"x=y"'), ('c', "'d'")])
+
+    def test_unterminated_quote(self):
+        """Test that an unterminated string is reported, with or without an assignment"""
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            split_kwargs(['a="x'])
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            split_kwargs(['"x'])
+
+    def test_missing_sides(self):
+        """Test that an assignment without a side is reported"""
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            split_kwargs(['=', 'a'])
+
+        with self.assertRaises(template.TemplateSyntaxError):
+            split_kwargs(['a', '='])
+
+class ReduceNodelistTest(SimpleTestCase):
+
+    def test_contains_nontext(self):
+        """Test that the reduced nodelist keeps Django's flag of having non-text nodes"""
+
+        nodelist = template.Template(' a {# comment #} ').nodelist
+        self.assertFalse(reduce_nodelist(nodelist).contains_nontext)
+
+        nodelist = template.Template(' a {{ b }} ').nodelist
+        self.assertTrue(reduce_nodelist(nodelist).contains_nontext)
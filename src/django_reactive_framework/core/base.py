@@ -1,8 +1,10 @@
 from abc import abstractmethod
+from contextvars import ContextVar
 from typing import Dict, Iterable, List, Optional, Union, Tuple
 
+from functools import lru_cache
 from itertools import chain
-import uuid
+import os
 
 from pathlib import Path
 
@@ -16,15 +18,18 @@ count_str = 'react_currect_count'
 count_reactcontent_str = 'currect_reactcontent_count'
 
 def next_id_by_context(context: template.Context, type_identifier: str) -> int:
-    if not context.get(type_identifier):
-        context[type_identifier] = 0
-    
-    currect = context[type_identifier]
+    currect = context.get(type_identifier, 0)
     context[type_identifier] = currect + 1
 
     return currect
 
 def value_to_expression(val):
+    # Fast path for the exact types, bool and int are disambiguated by the exact type.
+    # Subclasses fall back to the isinstance checks below.
+    if (constructor := value_to_expression_by_type.get(type(val))) is not None:
+        return constructor(val)
+    # otherwise
+
     if isinstance(val, ReactData):
         return NewReactDataExpression(val)
     elif isinstance(val, str):
@@ -36,7 +41,7 @@ def value_to_expression(val):
     elif isinstance(val, float):
         return FloatExpression(val)
     elif val is None:
-        return NoneExpression()
+        return none_expression
     elif isinstance(val, list):
         return ArrayExpression([value_to_expression(element) for element in val])
     elif isinstance(val, dict):
@@ -45,14 +50,50 @@ def value_to_expression(val):
         raise template.TemplateSyntaxError(
             "Currently the only types supported are string, bool, int, float, none, arrays and dictionaries for reactive variables values.")
 
+# The errors which evaluating a constant expression is expected to raise, kept for the evaluation time when folding
+constant_evaluation_errors = (template.TemplateSyntaxError, TypeError, ValueError)
+
+# Only short strings are cached, to avoid pinning big texts in memory
+cached_text_max_length = 256
+
+# Hashable scalar types, whose JS representation can be cached
+scalar_types = frozenset((str, bool, int, type(None)))
+
 # One may be attempt to think that react_context is useless, but it's not since ReactData is a valid value.
 def value_js_representation(val: 'ReactValType', react_context: 'ReactContext', delimiter: str = sq):
+    val_type = type(val)
+    # 0.0 and -0.0 are the same cache key but have different representations, so zeros aren't cached.
+    # Like in text_js_representation, only short strings are cached.
+    if (val_type in scalar_types and (val_type is not str or len(val) < cached_text_max_length)) or \
+        (val_type is float and val):
+
+        return scalar_js_representation(val_type, val, delimiter)
+    # otherwise
+
     expression: Expression = value_to_expression(val)
 
     js, hooks = expression.eval_js_and_hooks(react_context, delimiter=delimiter)
 
     return js
 
+# Scalars don't depend on the react context, and the type is part of the key so True and 1 don't collide
+@lru_cache(maxsize=256)
+def scalar_js_representation(val_type: type, val: 'ReactValType', delimiter: str) -> str:
+    js, hooks = value_to_expression(val).eval_js_and_hooks(None, delimiter=delimiter)
+
+    return js
+
+@lru_cache(maxsize=1024)
+def cached_text_js_representation(text: str) -> str:
+    return f"'{escapejs(text)}'"
+
+def text_js_representation(text: str) -> str:
+    if len(text) < cached_text_max_length:
+        return cached_text_js_representation(text)
+    # otherwise
+
+    return f"'{escapejs(text)}'"
+
 class ReactHook:
     @abstractmethod
     def get_name(self) -> str:
@@ -66,14 +107,22 @@ class ReactHook:
     def js_detach(self, js_attachment: str) -> str:
         pass
 
+# Shared hooks result of anything which doesn't depend on any reactive variable
+empty_hooks: Tuple[ReactHook, ...] = ()
+
 ReactValType = Union[str, bool, int, float, None, List['ReactValType'], Dict[str, 'ReactValType'], 'ReactData']
+
+# Marks that no initial value was saved, since None is a valid value
+no_saved_initial = object()
+
 class ReactData(ReactHook):
     def __init__(self, expression: 'Expression'):
         self.expression = expression
+        self.saved_initial: ReactValType = no_saved_initial
 
     def __str__(self) -> str:
         return f'ReactData(name={self.get_name()},expression={self.expression}' + \
-            (f', saved_initial={self.saved_initial}' if hasattr(self, 'saved_initial') else '') + \
+            (f', saved_initial={self.saved_initial}' if self.saved_initial is not no_saved_initial else '') + \
             ')'
     
     def __repr__(self) -> str:
@@ -84,15 +133,17 @@ class ReactData(ReactHook):
     
     @staticmethod
     def convert_hooks_to_js(hooks: Iterable[ReactHook]):
-        hooks = set(hooks)# Avoid repeated hooks
+        hooks = list(dict.fromkeys(hooks))# Avoid repeated hooks, but keep a stable order
 
-        if len(hooks) > 0:
+        if len(hooks) == 1:
+            return f'[{hooks[0].js()}]'
+        elif len(hooks) > 0:
             return f'[{",".join(hook.js() for hook in hooks)}]'
         else:
             return '__reactive_empty_array'
     
     def eval_initial(self, react_context: 'ReactContext'):
-        if hasattr(self, 'saved_initial'):
+        if self.saved_initial is not no_saved_initial:
             return self.saved_initial
         else:
             return self.expression.eval_initial(react_context)
@@ -105,7 +156,7 @@ class ReactData(ReactHook):
         js, hooks = self.eval_js_and_hooks(react_context)
 
         if clear_hooks:
-            hooks = []
+            hooks = empty_hooks
 
         hooks_js = ReactData.convert_hooks_to_js(hooks)
 
@@ -117,10 +168,10 @@ class ReactData(ReactHook):
         clear_hooks: bool = False, delimiter: str = sq):
 
         js, hooks = self.eval_js_and_hooks(react_context, delimiter) \
-            if other_expression is None else (other_expression, [])
+            if other_expression is None else (other_expression, empty_hooks)
         
         if clear_hooks:
-            hooks = []
+            hooks = empty_hooks
 
         if hooks:
             recalc_js_function = f'function(){{return {js};}}'
@@ -137,17 +188,20 @@ class ReactVar(ReactData):
         super().__init__(react_expression)
         self.name: str = name
         self.context: Optional[ReactContext] = None
+        # The js name depends only on the name and the context id, so it's cached until the context changes
+        self._js: Optional[str] = None
+        self._js_context: Optional[ReactContext] = None
 
     def __str__(self) -> str:
         return f'ReactVar(name: {repr(self.name)}, expression: {repr(self.expression)}, context: {repr(self.context)}' + \
-            (f', saved_initial={self.saved_initial}' if hasattr(self, 'saved_initial') else '') + \
+            (f', saved_initial={self.saved_initial}' if self.saved_initial is not no_saved_initial else '') + \
             ')'
 
     def get_name(self) -> str:
         return self.name
     
     def eval_initial(self, react_context: 'ReactContext'):
-        if hasattr(self, 'saved_initial'):
+        if self.saved_initial is not no_saved_initial:
             return self.saved_initial
         else:
             context = react_context if self.context is None else self.context
@@ -158,7 +212,11 @@ class ReactVar(ReactData):
         return self.expression.eval_js_and_hooks(context)
 
     def js(self) -> str:
-        return self.context.var_js(self)
+        if self._js_context is not self.context or self._js is None:
+            self._js = self.context.var_js(self)
+            self._js_context = self.context
+
+        return self._js
     
     def js_get(self) -> str:
         return "(" + self.js() + ".val)"
@@ -203,22 +261,86 @@ class ResorceScript:
         )
 
 reactcontext_str = 'reactcontext'
-reacttrack_uuid_str: str = uuid.uuid4().hex
-reacttrack_str = "react_track"
+text_node_kind = 0
+react_node_kind = 1
+tracked_node_kind = 2
+# Node type to its kind in generate_reduced_subtree, filled lazily since the node classes are fixed after parsing
+node_kind_by_type: Dict[type, int] = {}
+
+def classify_node_type(node_type: type) -> int:
+    if issubclass(node_type, template.base.TextNode):
+        node_kind = text_node_kind
+    elif issubclass(node_type, ReactNode):
+        node_kind = react_node_kind
+    else:
+        node_kind = tracked_node_kind
+    
+    node_kind_by_type[node_type] = node_kind
+
+    return node_kind
+
+def is_pure_text_nodelist(nodelist: template.NodeList) -> bool:
+    """ Return whether the nodelist has only text nodes. """
+
+    # Django's parser flags the nodelists which have non-text nodes, but nodelists built by hand aren't flagged
+    if getattr(nodelist, 'contains_nontext', False):
+        return False
+    # otherwise
+
+    return all(isinstance(node, template.base.TextNode) for node in nodelist)
+
+# Short marker wrapping tracked child indices in the rendered text. The private use area characters are rare in text,
+# and the random part makes sure that even icon font glyphs from this area won't be confused with the marker.
+reacttrack_uuid_str: str = '\ue000' + os.urandom(4).hex() + '\ue001'
 class ReactTracker:
     def __init__(self):
         self.children: List[ReactNode] = []
     
     @staticmethod
-    def get_current_tracker(template_context: template.Context):
-        return template_context.get(reacttrack_str)
+    def get_current_tracker() -> Optional['ReactTracker']:
+        return current_tracker.get()
 
     def create_child_tracker(self, node: 'ReactNode'):
         index = len(self.children)
         self.children.append(node)
 
-        tracker_str = reacttrack_uuid_str + str(index) + reacttrack_uuid_str
-        return tracker_str
+        if index < len(small_tracker_strs):
+            return small_tracker_strs[index]
+        # otherwise
+
+        return mark_safe(reacttrack_uuid_str + str(index) + reacttrack_uuid_str)
+
+    @staticmethod
+    def tokenize(render_result: str) -> List[Union[str, int]]:
+        """Split a render result into its text pieces and the indices of the tracked children"""
+
+        # Pieces alternate between plain text and tracked child indices
+        parts = render_result.split(reacttrack_uuid_str)
+        if len(parts) == 1:
+            return parts
+        # otherwise
+
+        if len(parts) % 2 == 0:
+            raise template.TemplateSyntaxError("Error in reactive template rendering tracking!")
+        # otherwise
+
+        # Add the last reminder only if isn't empty
+        if not parts[-1]:
+            parts.pop()
+
+        parts[1::2] = map(int, parts[1::2])
+
+        return parts
+
+# Most nodes have only a few tracked children, so their markers are prepared once
+small_tracker_strs: Tuple[str, ...] = tuple(
+    mark_safe(reacttrack_uuid_str + str(index) + reacttrack_uuid_str) for index in range(64))
+
+# The tracker of the non-react node currently being rendered, kept outside of the template context for cheap access
+current_tracker: ContextVar[Optional[ReactTracker]] = ContextVar('reactive_current_tracker', default=None)
+
+# The reduced subtree is built only by generate_reduced_subtree, whose strings are always exact str instances
+subtree_element_error_message = "All element of the internal subtree must be strings or pairs of form (ReactContext, subsubtree)!"
 
 class ReactContext:
     def __init__(self, id: str, parent: 'ReactContext' = None, fully_reactive: bool = False):
@@ -248,31 +370,33 @@ class ReactContext:
     def destroy(self):
         """Destroy all children when done, to help gc avoiding cycle references"""
 
-        self.parent = None
-        self.vars = None
+        stack: List[ReactContext] = [self]
 
-        for child in self.child_contexts:
-            child.destroy()
-        
-        self.child_contexts = None
+        while stack:
+            context = stack.pop()
+            stack.extend(context.child_contexts)
+
+            context.parent = None
+            context.vars = None
+            context.child_contexts = None
     
     # Clear render computation, need for many iteration rendering
     # TODO?: Don't use it, instead have a render board which contains varaibles, and have a result object after render.
     def clear_render(self):
-        self.vars: Dict[str, ReactVar] = {}
-        self.compute_initial = False
+        stack: List[ReactContext] = [self]
 
-        self.clear_render_inside()
-    
-    def clear_render_inside(self):
-        for child in self.child_contexts:
-            child.clear_render()
+        while stack:
+            context = stack.pop()
+            stack.extend(context.child_contexts)
+
+            context.vars = {}
+            context.compute_initial = False
     
     def id_prefix_expression(self) -> 'Expression':
         return StringExpression(self.id)
 
     def add_var(self, var: ReactVar):
-        if self.vars.get(var.name):
+        if var.name in self.vars:
             raise template.TemplateSyntaxError(
                 f"Can't add a new variable named {var.name} since it already define exactly in this context.")
         
@@ -282,17 +406,36 @@ class ReactContext:
         if self.compute_initial and var.expression is not None:
             var.saved_initial = var.expression.eval_initial(self)
     
-    def vars_needed_decleration(self):
+    def vars_needed_decleration(self) -> List[ReactVar]:
         """Virtual method which tells the parent what vars in its scope are needed to be declared"""
-        return sum([list(self.vars.values())] + [child.vars_needed_decleration() for child in self.child_contexts], [])
+
+        output: List[ReactVar] = []
+        stack: List[ReactContext] = [self]
+
+        # Pre-order traversal, since the declaration order matters for the output js
+        while stack:
+            context = stack.pop()
+
+            # Children which override this method decide by themselves what to declare in their subtree
+            if context is not self and \
+                type(context).vars_needed_decleration is not ReactContext.vars_needed_decleration:
+
+                output.extend(context.vars_needed_decleration())
+                continue
+            # otherwise
+
+            output.extend(context.vars.values())
+            stack.extend(reversed(context.child_contexts))
+
+        return output
     
     def search_var(self, name):
         current: ReactContext = self
 
-        while current != None:
+        while current is not None:
             var: Optional[ReactVar] = current.vars.get(name)
-            if var != None:
-                return var    
+            if var is not None:
+                return var
 
             current = current.parent
     
@@ -309,20 +452,17 @@ class ReactContext:
             return None
         # otherwise
 
-        strings: List[str] = []
-        for element in subtree:
-            if isinstance(element, str):
-                result = element
-            elif isinstance(element, tuple):
+        def render_element(element) -> str:
+            if type(element) is str:
+                return element
+            elif type(element) is tuple:
                 context, subsubtree = element
-                
-                result = context.render_html(subsubtree)
+
+                return context.render_html(subsubtree)
             else:
-                raise Exception("All element of the internal subtree must be strings or pairs of form (ReactContext, subsubtree)!")
-        
-            strings.append(result)
+                raise Exception(subtree_element_error_message)
 
-        return ''.join(strings)
+        return ''.join(render_element(element) for element in subtree)
 
     def render_script(self, subtree: Optional[List]) -> ResorceScript:
         return self.render_script_inside(subtree)
@@ -337,9 +477,9 @@ class ReactContext:
         destructor_scripts: List[str] = []
 
         for element in subtree:
-            if isinstance(element, str):
+            if type(element) is str:
                 continue
-            elif isinstance(element, tuple):
+            elif type(element) is tuple:
                 context, subsubtree = element
                 
                 result: ResorceScript = context.render_script(subsubtree)
@@ -353,7 +493,7 @@ class ReactContext:
                 if result.destructor:
                     destructor_scripts.append(result.destructor)
             else:
-                raise Exception("All element of the internal subtree must be scripts or pairs of form (ReactContext, subsubtree)!")
+                raise Exception(subtree_element_error_message)
 
         new_line = '\n'
         return ResorceScript(
@@ -364,46 +504,49 @@ class ReactContext:
     
     def render_js_and_hooks_inside(self, subtree: Optional[List]) -> Tuple[str, Iterable[ReactHook]]:
         if subtree is None:
-            return None, []
+            return None, empty_hooks
         # otherwise
 
-        js_and_hooks: List[str, Iterable[ReactHook]] = []
-        for element in subtree:
-            if isinstance(element, str):
-                result = f"'{escapejs(element)}'", []
-            elif isinstance(element, tuple):
+        def render_element(element) -> Tuple[str, Iterable[ReactHook]]:
+            if type(element) is str:
+                return text_js_representation(element), empty_hooks
+            elif type(element) is tuple:
                 context, subsubtree = element
                 
                 # TODO: Verify that context is ReactRerendableContext, maybe by the relation to funnly renderable?
                 
-                js_expression, hooks = context.render_js_and_hooks(subsubtree)
-
-                if not js_expression:
-                    continue
-
-                result = js_expression, hooks
+                return context.render_js_and_hooks(subsubtree)
             else:
-                raise Exception("All element of the internal subtree must be strings or pairs of form (ReactContext, subsubtree)!")
-        
-            js_and_hooks.append(result)
+                raise Exception(subtree_element_error_message)
+
+        js_and_hooks = [result for result in map(render_element, subtree) if result[0]]
 
-        js_expressions = [js_expression for js_expression, hooks in js_and_hooks]
-        all_hooks = [hooks for js_expression, hooks in js_and_hooks]
-        return '+'.join(js_expressions), chain(*all_hooks)
+        return '+'.join(js_expression for js_expression, hooks in js_and_hooks), \
+            chain.from_iterable(hooks for js_expression, hooks in js_and_hooks)
     
     def generate_reduced_subtree(self, nodelist: Optional[template.NodeList], template_context: template.Context) -> List:
         if nodelist is None:
             return None
+        elif is_pure_text_nodelist(nodelist):
+            # No react node can be inside, so there is nothing to track
+            return [''.join(node.render(template_context) for node in nodelist)] if nodelist else []
         # otherwise
 
         output_list = []
+        # Subsequential strings are buffered here and joined into a single element
+        pending_text: List[str] = []
 
-        # TODO: Reduce subsequential strings
+        def flush_text():
+            if pending_text:
+                output_list.append(''.join(pending_text))
+                pending_text.clear()
 
         def parse_text(text_result: str):
-            output_list.append(text_result)
+            pending_text.append(text_result)
 
         def parse_react_node(node: ReactNode):
+            flush_text()
+
             context = node.make_context(self, template_context)
             subtree = context.generate_reduced_subtree(node.nodelist, template_context)
 
@@ -411,44 +554,31 @@ class ReactContext:
             output_list.append(result)
 
         for node in nodelist:
-            if isinstance(node, template.base.TextNode):
+            node_kind = node_kind_by_type.get(type(node))
+            if node_kind is None:
+                node_kind = classify_node_type(type(node))
+
+            if node_kind == text_node_kind:
                 result = node.render(template_context)
                 parse_text(result)
-            elif isinstance(node, ReactNode):
+            elif node_kind == react_node_kind:
                 parse_react_node(node)
             else:
-                parent_tracker = template_context.get(reacttrack_str)
-
                 tracker = ReactTracker()
-                template_context[reacttrack_str] = tracker
-                render_result: str = node.render(template_context)
-                j = 0
-                i = render_result.find(reacttrack_uuid_str)
-                if i == -1:
-                    parse_text(render_result)
-
-                while i != -1:
-                    parse_text(render_result[j:i])
-
-                    i += len(reacttrack_uuid_str)
-                    j = render_result.find(reacttrack_uuid_str, i)
-                    if j == -1:
-                        raise template.TemplateSyntaxError("Error in reactive template rendering tracking!")
-
-                    node_index = int(render_result[i:j])
-                    node = tracker.children[node_index]
-                    parse_react_node(node)
-
-                    j += len(reacttrack_uuid_str)
-
-                    i = render_result.find(reacttrack_uuid_str, j)
-                
-                # Add the last reminder, if was in the while loop (if any)
-                if j > 0 and j < len(render_result):
-                    parse_text(render_result[j:])
-
-                template_context[reacttrack_str] = parent_tracker
+                tracker_token = current_tracker.set(tracker)
+                try:
+                    render_result: str = node.render(template_context)
+                finally:
+                    current_tracker.reset(tracker_token)
+
+                for token in ReactTracker.tokenize(render_result):
+                    if isinstance(token, int):
+                        parse_react_node(tracker.children[token])
+                    else:
+                        parse_text(token)
         
+        flush_text()
+
         return output_list
     
     @staticmethod
@@ -501,11 +631,12 @@ class ReactNode(template.Node):
 
             current_context = self.make_context(parent_context, template_context)
 
+            # Not using template_context.push(), since it would also drop the id counters set while rendering
             template_context[reactcontext_str] = current_context
-
-            subtree = None if (self.nodelist is None) else current_context.generate_reduced_subtree(self.nodelist, template_context)
-
-            template_context[reactcontext_str] = None
+            try:
+                subtree = None if (self.nodelist is None) else current_context.generate_reduced_subtree(self.nodelist, template_context)
+            finally:
+                template_context[reactcontext_str] = None
 
             output = current_context.render_html(subtree)
 
@@ -519,13 +650,19 @@ class ReactNode(template.Node):
             # Recuservly destroy all context in order to help the garbage collector
             current_context.destroy()
 
-            return output + ('<script>\n{\n' + \
-                reactive_script + '\n' + \
-                var_defs + '\n' + \
-                script.initial_post_calc + '\n' + \
-                '}\n</script>' if script else '')
+            if not script:
+                return output
+            # otherwise
+
+            # Each block carries its own copy of the script, since it might be served alone (e.g. from a cache)
+            return ''.join((output,
+                '<script>\n{\n',
+                reactive_script, '\n',
+                var_defs, '\n',
+                script.initial_post_calc, '\n',
+                '}\n</script>'))
         else:
-            tracker: Optional[ReactTracker] = ReactTracker.get_current_tracker(template_context)
+            tracker: Optional[ReactTracker] = ReactTracker.get_current_tracker()
 
             if not tracker:
                 raise Exception("Internal error in reactive -" + \
@@ -553,7 +690,7 @@ class ReactBlockReplaceNode(template.Node):
             raise Exception('ReactBlockReplaceNode cannot be on toplevel!')
         # otherwise
 
-        parent: Optional[ReactTracker] = ReactTracker.get_current_tracker(template_context)
+        parent: Optional[ReactTracker] = ReactTracker.get_current_tracker()
 
         if not parent:
             raise Exception("Internal error in reactive -" + \
@@ -576,4 +713,15 @@ class ReactBlockReplaceNode(template.Node):
         
         return value
 
-from .expressions import *
\ No newline at end of file
+from .expressions import *
+
+value_to_expression_by_type = {
+    str: StringExpression,
+    bool: lambda val: true_expression if val else false_expression,
+    int: IntExpression,
+    float: FloatExpression,
+    type(None): lambda val: none_expression,
+    list: lambda val: ArrayExpression([value_to_expression(element) for element in val]),
+    dict: lambda val: DictExpression({str(key): value_to_expression(_val) for key, _val in val.items()}),
+    ReactData: NewReactDataExpression,
+}
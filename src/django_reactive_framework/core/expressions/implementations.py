@@ -1,10 +1,13 @@
+from abc import abstractmethod
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from itertools import chain
+from functools import lru_cache, reduce as reduce_sequence
+from operator import getitem
 
 from django import template
 
-from ..base import ReactContext, ReactData, ReactValType, ReactHook, ReactVar, value_js_representation, value_to_expression
+from ..base import ReactContext, ReactData, ReactValType, ReactHook, ReactVar, constant_evaluation_errors, empty_hooks, \
+    value_js_representation, value_to_expression
 from ..reactive_function import ReactiveFunction
 from ..reactive_binary_operators import ReactiveBinaryOperator
 from ..reactive_unary_operators import ReactiveUnaryOperator
@@ -12,16 +15,20 @@ from ..utils import remove_whitespaces_on_boundaries, str_repr, str_repr_s, pars
 
 from .interfaces import Expression, SettableExpression
 
+common_open_delimiters = tuple(begin_delimiter for begin_delimiter, end_delimiter, processor in common_delimiters)
+
 class StringExpression(Expression):
+    __slots__ = ('val', '_js_sq')
+
     def __init__(self, val: str):
         self.val = val
+        self._js_sq: str = str_repr(val, sq)
     
     def __str__(self) -> str:
         return str_repr_s(self.val)
     
-    @property
-    def constant(self) -> bool:
-        return True
+    # A literal is always constant, so it's a plain class attribute rather than a property
+    constant = True
     
     def reduce(self, template_context: template.Context):
         return self
@@ -30,10 +37,10 @@ class StringExpression(Expression):
         return self.val
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return str_repr(self.val, delimiter), []
+        return (self._js_sq if delimiter == sq else str_repr(self.val, delimiter)), empty_hooks
 
     def eval_js_html_output_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return str_repr(self.val, delimiter), []
+        return (self._js_sq if delimiter == sq else str_repr(self.val, delimiter)), empty_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['StringExpression']:
@@ -47,16 +54,32 @@ class StringExpression(Expression):
         
         return None
 
+# Shared expressions of the small ints, which are immutable like the ints themselves (filled lazily)
+small_int_expressions: Dict[int, 'IntExpression'] = {}
+
 class IntExpression(Expression):
+    __slots__ = ('val', '_js')
+
+    def __new__(cls, val: int):
+        # The same range which CPython caches for the ints
+        if cls is IntExpression and type(val) is int and -5 <= val <= 256:
+            expression = small_int_expressions.get(val)
+            if expression is None:
+                expression = small_int_expressions[val] = super().__new__(cls)
+            
+            return expression
+        # otherwise
+
+        return super().__new__(cls)
+
     def __init__(self, val: int):
         self.val = val
+        self._js: str = str(val)
     
     def __str__(self) -> str:
         return f'{self.val}'
     
-    @property
-    def constant(self) -> bool:
-        return True
+    constant = True
     
     def reduce(self, template_context: template.Context):
         return self
@@ -65,13 +88,21 @@ class IntExpression(Expression):
         return self.val
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return str(self.val), []
+        return self._js, empty_hooks
 
     def eval_js_html_output_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return f'{delimiter}{self.val}{delimiter}', []
+        return f'{delimiter}{self.val}{delimiter}', empty_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['IntExpression']:
+        # Fast path for the common plain decimal literal
+        if expression.isascii() and expression.isdigit():
+            try:
+                return IntExpression(int(expression))
+            except ValueError:
+                return None# Longer than the int string conversion limit
+        # otherwise
+
         if '.' in expression:
             return None# It might be float
         # otherwise
@@ -84,15 +115,16 @@ class IntExpression(Expression):
         return IntExpression(number)
 
 class FloatExpression(Expression):
+    __slots__ = ('val', '_js')
+
     def __init__(self, val: float):
         self.val = val
+        self._js: str = str(val)
     
     def __str__(self) -> str:
         return f'{self.val}'
     
-    @property
-    def constant(self) -> bool:
-        return True
+    constant = True
     
     def reduce(self, template_context: template.Context):
         return self
@@ -101,10 +133,10 @@ class FloatExpression(Expression):
         return self.val
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return str(self.val), []
+        return self._js, empty_hooks
 
     def eval_js_html_output_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return f'{delimiter}{self.val}{delimiter}', []
+        return f'{delimiter}{self.val}{delimiter}', empty_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['FloatExpression']:
@@ -116,15 +148,16 @@ class FloatExpression(Expression):
         return FloatExpression(number)
 
 class BoolExpression(Expression):
+    __slots__ = ('val', '_js')
+
     def __init__(self, val: bool):
         self.val = val
+        self._js: str = 'true' if val else 'false'
     
     def __str__(self) -> str:
         return f'{self.val}'
     
-    @property
-    def constant(self) -> bool:
-        return True
+    constant = True
     
     def reduce(self, template_context: template.Context):
         return self
@@ -133,30 +166,30 @@ class BoolExpression(Expression):
         return self.val
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return 'true' if self.val else 'false', []
+        return self._js, empty_hooks
 
-    def eval_js_html_output_and_hooks(self, react_context: Optional['ReactContext']) -> Tuple[str, List['ReactHook']]:
-        return f"'{str(self.val)}'"
+    def eval_js_html_output_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
+        return f'{delimiter}{self.val}{delimiter}', empty_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['BoolExpression']:
         if expression == 'True' or expression == 'true':
-            return BoolExpression(True)
+            return true_expression
         elif expression == 'False' or expression == 'false':
-            return BoolExpression(False)
+            return false_expression
         else:
             return None
 
 class NoneExpression(Expression):
+    __slots__ = ()
+
     def __init__(self):
         pass
     
     def __str__(self) -> str:
         return f'None'
     
-    @property
-    def constant(self) -> bool:
-        return True
+    constant = True
     
     def reduce(self, template_context: template.Context):
         return self
@@ -165,41 +198,97 @@ class NoneExpression(Expression):
         return None
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return 'null', []
+        return 'null', empty_hooks
 
     def eval_js_html_output_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return f"'None'"
+        return f'{delimiter}None{delimiter}', empty_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['NoneExpression']:
         if expression == 'None' or expression == 'null':
-            return NoneExpression()
+            return none_expression
         else:
             return None
 
-class ArrayExpression(Expression):
-    def __init__(self, elements_expression: List[Expression]):
-        self.elements_expression: List[Expression] = elements_expression
-    
-    def __str__(self) -> str:
-        return f'[{", ".join(str(expression) for expression in self.elements_expression)}]'
-    
+# Shared instances of the stateless literals
+true_expression = BoolExpression(True)
+false_expression = BoolExpression(False)
+none_expression = NoneExpression()
+
+def all_same(expressions: Iterable[Expression], original_expressions: Iterable[Expression]) -> bool:
+    """ Return whether reducing kept every subexpression as the very same object. """
+    return all(expression is original for expression, original in zip(expressions, original_expressions))
+
+class LazyConstantExpression(Expression):
+    """ An expression built of subexpressions, which computes its constness only once on first access. """
+
+    # Not computed yet, many expressions are built and thrown away without ever being asked
+    _constant: Optional[bool] = None
+
     @property
     def constant(self) -> bool:
-        for element in self.elements_expression:
-            if not element.constant:
-                return False
+        if self._constant is None:
+            self._constant = self.compute_constant()
+
+        return self._constant
+
+    @abstractmethod
+    def compute_constant(self) -> bool:
+        pass
+
+class CompositeExpression(LazyConstantExpression):
+    """ An expression built of subexpressions, which caches its js when it's constant. """
+
+    # Created on the first js evaluation of a constant expression
+    _constant_js: Optional[Dict[str, str]] = None
+
+    def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
+        # The js of a constant expression doesn't depend on the react context
+        if self.constant:
+            if self._constant_js is None:
+                self._constant_js = {}
+
+            if (js := self._constant_js.get(delimiter)) is None:
+                js = self._constant_js[delimiter] = self.compute_js_and_hooks(None, delimiter)[0]
+            
+            return js, empty_hooks
         # otherwise
 
-        return True
+        return self.compute_js_and_hooks(react_context, delimiter)
+
+    @abstractmethod
+    def compute_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
+        pass
+
+class ArrayExpression(CompositeExpression):
+    def __init__(self, elements_expression: List[Expression]):
+        self.elements_expression: Tuple[Expression, ...] = tuple(elements_expression)
+    
+    def __str__(self) -> str:
+        if self._str is None:
+            self._str = f'[{", ".join(str(expression) for expression in self.elements_expression)}]'
+
+        return self._str
+    
+    def compute_constant(self) -> bool:
+        return all(element.constant for element in self.elements_expression)
     
     def reduce(self, template_context: template.Context):
-        return ArrayExpression([expression.reduce(template_context) for expression in self.elements_expression])
+        if self.constant:
+            return self
+        # otherwise
+
+        elements_reduced = [expression.reduce(template_context) for expression in self.elements_expression]
+        if all_same(elements_reduced, self.elements_expression):
+            return self
+        # otherwise
+
+        return ArrayExpression(elements_reduced)
     
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
         return [expression.eval_initial(react_context) for expression in self.elements_expression]
 
-    def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
+    def compute_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
         js_expressions, all_hooks = [], []
 
         for expression in self.elements_expression:
@@ -208,7 +297,7 @@ class ArrayExpression(Expression):
             js_expressions.append(js_expression)
             all_hooks.extend(hooks)
         
-        return f'[{",".join((expression for expression in js_expressions))}]', all_hooks
+        return f'[{",".join(js_expressions)}]', all_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['ArrayExpression']:
@@ -222,35 +311,39 @@ class ArrayExpression(Expression):
 
         return ArrayExpression([parse_expression(part) for part in parts])
 
-class DictExpression(Expression):
+class DictExpression(CompositeExpression):
     def __init__(self, dict_expression: Dict[str, Expression]):
         self.dict_expression = dict_expression
-        self.has_react_data = False
-
-        for key, expression in self.dict_expression.items():
-            if isinstance(expression, NewReactDataExpression):
-                self.has_react_data = True
-                break
     
     def __str__(self) -> str:
-        return f'{{{",".join((f"{key}:{str(expression)}" for key, expression in self.dict_expression.items()))}}}'
+        if self._str is None:
+            self._str = f'{{{",".join((f"{key}:{str(expression)}" for key, expression in self.dict_expression.items()))}}}'
+
+        return self._str
+    
+    def compute_constant(self) -> bool:
+        return all(expression.constant for expression in self.dict_expression.values())
     
     @property
-    def constant(self) -> bool:
-        for key, expression in self.dict_expression.items():
-            if not expression.constant:
-                return False
-        # otherwise
-
-        return True
+    def has_react_data(self) -> bool:
+        return any(isinstance(expression, NewReactDataExpression) for expression in self.dict_expression.values())
     
     def reduce(self, template_context: template.Context):
-        return DictExpression({key: expression.reduce(template_context) for key, expression in self.dict_expression.items()})
+        if self.constant:
+            return self
+        # otherwise
+
+        dict_reduced = {key: expression.reduce(template_context) for key, expression in self.dict_expression.items()}
+        if all_same(dict_reduced.values(), self.dict_expression.values()):
+            return self
+        # otherwise
+
+        return DictExpression(dict_reduced)
     
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
         return {key: expression.eval_initial(react_context) for key, expression in self.dict_expression.items()}
 
-    def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
+    def compute_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
         key_js_expressions, all_hooks = [], []
 
         for key, expression in self.dict_expression.items():
@@ -261,14 +354,14 @@ class DictExpression(Expression):
         
         if self.has_react_data:
             js_result = \
-                '( () => {\n'+ \
+                '( () => {\n' + \
                     ''.join(f'const {key}={js_expression};\n' for key, js_expression in key_js_expressions) + \
                     'return {' + \
-                        ','.join((f'{key}:{key}' for key, js_expression in key_js_expressions)) + \
+                        ','.join(f'{key}:{key}' for key, js_expression in key_js_expressions) + \
                     '};\n' + \
                 '} )()'
         else:
-            js_result = f'{{{",".join((f"{key}:{js_expression}" for key, js_expression in key_js_expressions))}}}'
+            js_result = f'{{{",".join(f"{key}:{js_expression}" for key, js_expression in key_js_expressions)}}}'
         
         return js_result, all_hooks
     
@@ -381,7 +474,7 @@ class NativeVariableExpression(SettableExpression):
         return self.initial_value
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return self.var_name, []
+        return self.var_name, empty_hooks
     
     def js_set(self, react_context: Optional['ReactContext'], js_expression: str,
         expression_hooks: Iterable['ReactVar'] = []) -> str:
@@ -391,30 +484,46 @@ class NativeVariableExpression(SettableExpression):
     def js_notify(self, react_context: Optional['ReactContext']) -> str:
         return ''
 
-class PropertyExpression(Expression):
+class PropertyExpression(LazyConstantExpression):
     def __init__(self, root_expression: Expression, key_path: List[str]):
         # TODO: Support also "[]" and not only "."
 
         assert(key_path)
 
         self.root_expression: Expression = root_expression
-        self.key_path: List[str] = key_path
+        self.key_path: Tuple[str, ...] = tuple(key_path)
+        # The key path is fixed, so its js part is joined only once
+        self._js_suffix: str = '.' + '.'.join(self.key_path)
     
     def __str__(self):
-        return '(' + str(self.root_expression) + ').' + '.'.join(self.key_path)
+        if self._str is None:
+            self._str = '(' + str(self.root_expression) + ')' + self._js_suffix
+
+        return self._str
     
-    @property
-    def constant(self) -> bool:
+    def compute_constant(self) -> bool:
         return self.root_expression.constant
     
     def reduce(self, template_context: template.Context):
+        if self.constant:
+            return self
+        # otherwise
+
         root_expression_reduced = self.root_expression.reduce(template_context)
+        if root_expression_reduced is self.root_expression:
+            return self
+        # otherwise
         
         return PropertyExpression(root_expression_reduced, self.key_path)
     
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
         root_val = self.root_expression.eval_initial(react_context)
 
+        try:
+            return reduce_sequence(getitem, self.key_path, root_val)
+        except (KeyError, IndexError, TypeError):
+            pass# Walk again with checks, for reporting the error
+        
         current: 'ReactValType' = root_val
 
         for key in self.key_path:
@@ -430,11 +539,19 @@ class PropertyExpression(Expression):
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
         root_var_js, hooks = self.root_expression.eval_js_and_hooks(react_context, delimiter)
 
-        return '(' + root_var_js + ').' + '.'.join(self.key_path), hooks
+        return '(' + root_var_js + ')' + self._js_suffix, hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['PropertyExpression']:
-        parts = list(smart_split(expression, ['.'], common_delimiters, skip_blank=False))
+        if '.' not in expression:
+            return None
+        # otherwise
+
+        if any(char in expression for char in common_open_delimiters):
+            parts = list(smart_split(expression, ['.'], common_delimiters, skip_blank=False))
+        else:
+            # Nothing can hide a dot, so it's exactly the same as the full scan
+            parts = expression.split('.')
 
         if len(parts) <= 1:
             return None
@@ -461,10 +578,20 @@ class SettablePropertyExpression(PropertyExpression, SettableExpression):
         super().__init__(root_expression, key_path)
     
     def __str__(self):
-        return str(self.root_expression) + '.' + '.'.join(self.key_path)
+        if self._str is None:
+            self._str = str(self.root_expression) + self._js_suffix
+
+        return self._str
     
     def reduce(self, template_context: template.Context):
+        if self.constant:
+            return self
+        # otherwise
+
         root_expression_reduced = self.root_expression.reduce(template_context)
+        if root_expression_reduced is self.root_expression:
+            return self
+        # otherwise
         
         return SettablePropertyExpression(root_expression_reduced, self.key_path)
     
@@ -479,14 +606,17 @@ class SettablePropertyExpression(PropertyExpression, SettableExpression):
         settable_expression: SettableExpression = self.root_expression
         return settable_expression.js_notify(react_context)
 
-class TernaryOperatorExpression(Expression):
+class TernaryOperatorExpression(LazyConstantExpression):
     def __init__(self, condition: Expression, expression_if_true: Expression, expression_if_false: Expression):
         self.condition = condition
         self.expression_if_true = expression_if_true
         self.expression_if_false = expression_if_false
     
     def __str__(self) -> str:
-        return f'({self.condition}?{self.expression_if_true}:{self.expression_if_false})'
+        if self._str is None:
+            self._str = f'({self.condition}?{self.expression_if_true}:{self.expression_if_false})'
+
+        return self._str
     
     def eval_condition_initial(self, react_context: Optional['ReactContext']) -> bool:
         condition_val = self.condition.eval_initial(react_context)
@@ -497,23 +627,45 @@ class TernaryOperatorExpression(Expression):
 
         return condition_val
     
-    @property
-    def constant(self) -> bool:
+    def compute_constant(self) -> bool:
         if not self.condition.constant:
             return False
         # otherwise
 
-        if self.eval_condition_initial(None):
-            return self.expression_if_true.constant
-        else:
-            return self.expression_if_false.constant
+        try:
+            condition_val = self.eval_condition_initial(None)
+        except constant_evaluation_errors:
+            # Keep the error for the evaluation time
+            return False
+        
+        return (self.expression_if_true if condition_val else self.expression_if_false).constant
     
     def reduce(self, template_context: template.Context):
         condition = self.condition.reduce(template_context)
         expression_if_true = self.expression_if_true.reduce(template_context)
         expression_if_false = self.expression_if_false.reduce(template_context)
 
-        return TernaryOperatorExpression(condition, expression_if_true, expression_if_false)
+        if condition is self.condition and expression_if_true is self.expression_if_true and \
+            expression_if_false is self.expression_if_false:
+            return self.folded()
+        # otherwise
+
+        return TernaryOperatorExpression(condition, expression_if_true, expression_if_false).folded()
+    
+    def folded(self) -> Expression:
+        """ Return the chosen branch if the condition is constant, otherwise self. """
+
+        if not self.condition.constant:
+            return self
+        # otherwise
+
+        try:
+            condition_val = self.eval_condition_initial(None)
+        except constant_evaluation_errors:
+            # Keep the error (if any) for the evaluation time, like fold_if_constant
+            return self
+        
+        return self.expression_if_true if condition_val else self.expression_if_false
     
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
         if self.eval_condition_initial(react_context):
@@ -535,12 +687,16 @@ class TernaryOperatorExpression(Expression):
 
         false_js, false_hooks = self.expression_if_false.eval_js_and_hooks(react_context, delimiter)
 
-        all_hooks = list(chain(condition_hooks, true_hooks, false_hooks))
+        all_hooks = [*condition_hooks, *true_hooks, *false_hooks]
         
         return f'({condition_js}?{true_js}:{false_js})', all_hooks
     
     @staticmethod
     def try_parse(expression: str) -> Optional['TernaryOperatorExpression']:
+        if '?' not in expression:
+            return None
+        # otherwise
+
         parts1 = list(smart_split(expression, ('?',)))
         if len(parts1) < 2:
             return None
@@ -577,21 +733,28 @@ class TernaryOperatorExpression(Expression):
             raise template.TemplateSyntaxError(
                 f'Error when parsing ternary expression: fail to parse the if false expression: ({false_str})')
 
-        return TernaryOperatorExpression(condition, expression_if_true, expression_if_false)
+        return TernaryOperatorExpression(condition, expression_if_true, expression_if_false).folded()
 
 class FunctionCallExpression(Expression):
     def __init__(self, name: str, function: ReactiveFunction, args: List[Expression]):
         self.name = name
         self.function = function
-        self.args = args
+        self.args: Tuple[Expression, ...] = tuple(args)
 
-        function.validate_args(args)
+        function.validate_args(self.args)
     
     def __str__(self) -> str:
-        return f'{self.name}({",".join(str(arg) for arg in self.args)})'
+        if self._str is None:
+            self._str = f'{self.name}({",".join(str(arg) for arg in self.args)})'
+
+        return self._str
     
     def reduce(self, template_context: template.Context):
         args_reduced = [arg.reduce(template_context) for arg in self.args]
+        if all_same(args_reduced, self.args):
+            return self
+        # otherwise
+
         return FunctionCallExpression(self.name, self.function, args_reduced)
 
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
@@ -602,6 +765,10 @@ class FunctionCallExpression(Expression):
     
     @staticmethod
     def try_parse(expression: str) -> Optional['FunctionCallExpression']:
+        if '(' not in expression:
+            return None
+        # otherwise
+
         parts = list(smart_split(expression, ('(',), skip_blank=False))
         if len(parts) < 2:
             return None
@@ -637,34 +804,49 @@ class FunctionCallExpression(Expression):
 
         return FunctionCallExpression(function_name, function, args)
 
-class BinaryOperatorExpression(Expression):
+class BinaryOperatorExpression(CompositeExpression):
+    _optimized_args: Optional[Tuple[Expression, ...]] = None
+
     def __init__(self, operator_symbol: str, operator: ReactiveBinaryOperator, args: List[Expression]):
         self.operator_symbol = operator_symbol
         self.operator = operator
-        self.args = args
+        self.args: Tuple[Expression, ...] = tuple(args)
 
-        operator.validate_args(args)
+        operator.validate_args(self.args)
     
     def __str__(self) -> str:
-        return self.operator_symbol.join(str(arg) for arg in self.args)
-    
-    @property
-    def constant(self) -> bool:
-        for arg in self.args:
-            if not arg.constant:
-                return False
-        # otherwise
+        if self._str is None:
+            self._str = self.operator_symbol.join(str(arg) for arg in self.args)
 
-        return True
+        return self._str
+    
+    def compute_constant(self) -> bool:
+        return all(arg.constant for arg in self.args)
     
     def reduce(self, template_context: template.Context):
+        if self.constant:
+            return self
+        # otherwise
+
         args_reduced = [arg.reduce(template_context) for arg in self.args]
-        return BinaryOperatorExpression(self.operator_symbol, self.operator, args_reduced)
+        if all_same(args_reduced, self.args):
+            return self
+        # otherwise
+
+        return fold_if_constant(BinaryOperatorExpression(self.operator_symbol, self.operator, args_reduced))
 
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
         return self.operator.eval_initial(react_context, self.args)
     
-    def optimized_args(self):
+    def optimized_args(self) -> Tuple[Expression, ...]:
+        # The args never change, so they are optimized only once.
+        # It's done lazily and not in the constructor, to keep evaluation errors (if any) for the rendering time.
+        if self._optimized_args is None:
+            self._optimized_args = tuple(self.compute_optimized_args())
+
+        return self._optimized_args
+    
+    def compute_optimized_args(self) -> List[Expression]:
         # Optimize it to what is needed
 
         def calc_args_initial_expression(args: List[Expression]) -> Expression:
@@ -694,7 +876,7 @@ class BinaryOperatorExpression(Expression):
         
         return optimized_arg_list
 
-    def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
+    def compute_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
         optimized_args = self.optimized_args()
 
         if len(optimized_args) == 0:
@@ -703,16 +885,21 @@ class BinaryOperatorExpression(Expression):
             return optimized_args[0].eval_js_and_hooks(react_context, delimiter)
         # otherwise
 
-        js_expression = self.operator.eval_js(react_context, optimized_args, delimiter)
-
-        all_hooks = list(chain.from_iterable(arg.eval_js_and_hooks(react_context)[1] for arg in optimized_args))
-        
-        return js_expression, all_hooks
+        return self.operator.eval_js_and_hooks(react_context, optimized_args, delimiter)
     
     @staticmethod
     def try_parse(expression: str) -> Optional['BinaryOperatorExpression']:
+        if ReactiveBinaryOperator.operator_chars.isdisjoint(expression):
+            return None
+        # otherwise
+
         operator_found = None
         for symbol, operator in ReactiveBinaryOperator.operators.items():
+            # A cheap check before the full scan, which is still needed for skipping strings and brackets
+            if symbol not in expression:
+                continue
+            # otherwise
+
             parts = list(smart_split(expression, (symbol,), skip_blank=False))
             if len(parts) >= 2:
                 operator_found = operator
@@ -732,7 +919,12 @@ class BinaryOperatorExpression(Expression):
         
         args = [parse_expression(arg) for arg in arg_strings]
 
-        return BinaryOperatorExpression(symbol, operator, args)
+        folded_val = operator_found.try_fold(args)
+        if folded_val is not None:
+            return value_to_expression(folded_val)
+        # otherwise
+
+        return BinaryOperatorExpression(symbol, operator_found, args)
 
 # An alias for BinaryOperatorExpression with operator SumOperator
 class SumExpression(BinaryOperatorExpression):
@@ -746,7 +938,7 @@ class SumExpression(BinaryOperatorExpression):
         else:
             return SumExpression(args)
 
-class UnaryOperatorExpression(Expression):
+class UnaryOperatorExpression(LazyConstantExpression):
     def __init__(self, operator_symbol: str, operator: ReactiveUnaryOperator, arg: Expression):
         self.operator_symbol = operator_symbol
         self.operator = operator
@@ -755,22 +947,28 @@ class UnaryOperatorExpression(Expression):
         operator.validate_arg(arg)
     
     def __str__(self) -> str:
-        return f'{self.operator_symbol}{self.arg}'
+        if self._str is None:
+            self._str = f'{self.operator_symbol}{self.arg}'
+
+        return self._str
     
-    @property
-    def constant(self) -> bool:
+    def compute_constant(self) -> bool:
         return self.arg.constant
     
     def reduce(self, template_context: template.Context):
         arg_reduced = self.arg.reduce(template_context)
-        return UnaryOperatorExpression(self.operator_symbol, self.operator, arg_reduced)
+        if arg_reduced is self.arg:
+            return self
+        # otherwise
+
+        return fold_if_constant(UnaryOperatorExpression(self.operator_symbol, self.operator, arg_reduced))
 
     def eval_initial(self, react_context: Optional['ReactContext']) -> 'ReactValType':
         return self.operator.eval_initial(react_context, self.arg)
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
         if self.constant:
-            return value_js_representation(self.eval_initial(react_context), react_context, delimiter=delimiter), []
+            return value_js_representation(self.eval_initial(react_context), react_context, delimiter=delimiter), empty_hooks
         # otherwise
 
         js_expression = self.operator.eval_js(react_context, self.arg, delimiter)
@@ -811,27 +1009,35 @@ class NewReactDataExpression(Expression):
         return self.data
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
-        return self.data.initial_val_js(react_context, delimiter=delimiter), []
+        return self.data.initial_val_js(react_context, delimiter=delimiter), empty_hooks
 
 # TODO: Support also escaping '/' (if needed)
-class EscapingContainerExpression(Expression):
+class EscapingContainerExpression(LazyConstantExpression):
     def __init__(self, inner_expression: Expression, delimiter: str):
         self.inner_expression: Expression = inner_expression
         self.delimiter: str = delimiter
+        self._escaping_table: Dict[int, str] = str.maketrans({delimiter: '\\' + delimiter})
     
-    @property
-    def constant(self) -> bool:
+    def compute_constant(self) -> bool:
         return self.inner_expression.constant
     
     def __str__(self) -> str:
-        return f'Escaping-{self.delimiter}({self.inner_expression})'
+        if self._str is None:
+            self._str = f'Escaping-{self.delimiter}({self.inner_expression})'
+
+        return self._str
     
     def reduce(self, template_context: template.Context):
-        return EscapingContainerExpression(self.inner_expression.reduce(template_context), self.delimiter)
+        inner_expression_reduced = self.inner_expression.reduce(template_context)
+        if inner_expression_reduced is self.inner_expression:
+            return self
+        # otherwise
+
+        return EscapingContainerExpression(inner_expression_reduced, self.delimiter)
     
     def eval_initial(self, react_context: Optional['ReactContext']) -> str:
         return str(self.inner_expression.eval_initial(react_context)) \
-            .translate(str.maketrans({self.delimiter: '\\' + self.delimiter}))
+            .translate(self._escaping_table)
 
     def eval_js_and_hooks(self, react_context: Optional['ReactContext'], delimiter: str = sq) -> Tuple[str, List['ReactHook']]:
         inner_js_expression, hooks = self.inner_expression.eval_js_and_hooks(react_context)
@@ -842,11 +1048,56 @@ class EscapingContainerExpression(Expression):
         
         return js_expression, hooks
 
+literal_expression_by_keyword = {
+    'True': true_expression,
+    'true': true_expression,
+    'False': false_expression,
+    'false': false_expression,
+    'None': none_expression,
+    'null': none_expression,
+}
+
+# Literal parsers are tried only if the first character might start their literal.
+# Booleans and None are already covered by literal_expression_by_keyword.
+string_first_chars = frozenset('\'"')
+number_first_chars = frozenset('0123456789+-.')
+float_word_first_chars = frozenset('iInN')# inf, infinity and nan
+
+literal_expression_types = (StringExpression, IntExpression, FloatExpression, BoolExpression, NoneExpression)
+
+def fold_if_constant(expression: Expression) -> Expression:
+    """ Replace a constant composite expression by the literal expression of its value. """
+
+    if not expression.constant or isinstance(expression, literal_expression_types):
+        return expression
+    # otherwise
+
+    try:
+        val = expression.eval_initial(None)
+    except constant_evaluation_errors:
+        # Keep the error (if any) for the evaluation time
+        return expression
+    
+    return value_to_expression(val)
+
+# Expressions are immutable, so the same parsed instance can be shared by all the places using the same source
+@lru_cache(maxsize=4096)
 def parse_expression(expression: str):
+    return fold_if_constant(parse_expression_unfolded(expression))
+
+def parse_expression_unfolded(expression: str):
     expression = remove_whitespaces_on_boundaries(expression)
 
+    if exp := literal_expression_by_keyword.get(expression):
+        return exp
+    # otherwise
+
+    first_char = expression[0]
+    # int() and float() also accept non-ASCII digits and other whitespaces
+    might_be_number = first_char in number_first_chars or first_char.isdigit() or first_char.isspace()
+
     is_parentheses = False
-    if expression[0] == '(' and expression[-1] == ')':
+    if first_char == '(' and expression[-1] == ')':
         parts = list(smart_split(expression[1:], [')'], skip_blank=False))
         if len(parts) == 2 and not parts[1]:
             is_parentheses = True
@@ -855,19 +1106,15 @@ def parse_expression(expression: str):
         return parse_expression(expression[1:-1])
     elif exp := TernaryOperatorExpression.try_parse(expression):
         return exp
-    elif exp := StringExpression.try_parse(expression):
-        return exp
-    elif exp := BoolExpression.try_parse(expression):
-        return exp
-    elif exp := IntExpression.try_parse(expression):
+    elif first_char in string_first_chars and (exp := StringExpression.try_parse(expression)):
         return exp
-    elif exp := FloatExpression.try_parse(expression):
+    elif might_be_number and (exp := IntExpression.try_parse(expression)):
         return exp
-    elif exp := NoneExpression.try_parse(expression):
+    elif (might_be_number or first_char in float_word_first_chars) and (exp := FloatExpression.try_parse(expression)):
         return exp
-    elif exp := ArrayExpression.try_parse(expression):
+    elif first_char == '[' and (exp := ArrayExpression.try_parse(expression)):
         return exp
-    elif exp := DictExpression.try_parse(expression):
+    elif first_char == '{' and (exp := DictExpression.try_parse(expression)):
         return exp
     elif exp := UnaryOperatorExpression.try_parse(expression):
         return exp
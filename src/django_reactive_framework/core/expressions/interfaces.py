@@ -9,6 +9,12 @@ from ..utils import sq
 class Expression:
     """ An immutable structure for holding expressions. """
 
+    # Empty, so the literal expressions can avoid an instance dict by declaring their own slots
+    __slots__ = ()
+
+    # Lazily computed string representation, for expressions made of subexpressions
+    _str: Optional[str] = None
+
     def __repr__(self) -> str:
         return f'{super().__repr__()}({str(self)})'
     
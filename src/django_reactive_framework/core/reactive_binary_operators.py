@@ -1,14 +1,17 @@
 from abc import abstractmethod
-from typing import Dict, List
+from types import MappingProxyType
+from typing import FrozenSet, Iterable, List, Mapping, Optional, Tuple
 
 from django import template
 
-from .base import ReactContext, ReactValType
+from .base import ReactContext, ReactHook, ReactValType, constant_evaluation_errors
 from .expressions.interfaces import Expression
 from .utils import manual_non_empty_sum
 
 class ReactiveBinaryOperator:
-    operators: Dict[str, 'ReactiveBinaryOperator'] = dict()
+    operators: Mapping[str, 'ReactiveBinaryOperator'] = dict()
+    # All the characters used by the operator symbols, filled once the registry is frozen
+    operator_chars: FrozenSet[str] = frozenset()
 
     def validate_args(self, args: List['Expression']) -> None:
         if len(args) < 2:
@@ -34,6 +37,25 @@ class ReactiveBinaryOperator:
 
         return self.eval_js_from_js(vals, delimiter)
 
+    def eval_js_and_hooks(self, reactive_context: 'ReactContext', args: List['Expression'], delimiter: str) -> \
+        Tuple[str, List['ReactHook']]:
+
+        self.validate_args(args)
+
+        # Each arg is evaluated once for both its js and its hooks
+        js_expressions: List[str] = []
+        all_hooks: List['ReactHook'] = []
+        for arg in args:
+            js_expression, hooks = arg.eval_js_and_hooks(reactive_context, delimiter)
+            js_expressions.append(js_expression)
+            all_hooks.extend(hooks)
+
+        return self.eval_js_from_js(js_expressions, delimiter), all_hooks
+
+    def try_fold(self, args: List['Expression']) -> Optional['ReactValType']:
+        """ Return the value of the operator if it is known only from its constant args, otherwise None. """
+        return None
+
 class StrictEqualityOperator(ReactiveBinaryOperator):
     def validate_args(self, args: List['Expression']) -> None:
         if len(args) != 2:
@@ -78,21 +100,42 @@ class StrictInequalityOperator(ReactiveBinaryOperator):
 ReactiveBinaryOperator.operators['!=='] = StrictInequalityOperator()
 
 class BoolComparingOperator(ReactiveBinaryOperator):
+    # The value which decides the result once an arg evaluates to it
+    short_circuit_val: bool
+
     @abstractmethod
-    def eval_initial_from_values(self, vals: List[bool]) -> bool:
+    def eval_initial_from_values(self, vals: Iterable[bool]) -> bool:
         pass
 
     def eval_initial(self, reactive_context: 'ReactContext', args: List['Expression']) -> bool:
-        return super().eval_initial(reactive_context, args)
+        self.validate_args(args)
+
+        # The values are evaluated lazily, so the operator can short-circuit like JS does
+        return self.eval_initial_from_values(arg.eval_initial(reactive_context) for arg in args)
+
+    def try_fold(self, args: List['Expression']) -> Optional[bool]:
+        # Only the leading constant args can be folded, since in JS a former arg might be returned as is
+        for arg in args:
+            if not arg.constant:
+                break
+            # otherwise
+
+            try:
+                val = arg.eval_initial(None)
+            except constant_evaluation_errors:
+                # Keep the error (if any) for the evaluation time
+                break
+
+            if val is self.short_circuit_val:
+                return val
+        
+        return None
 
 class AndOperator(BoolComparingOperator):
-    def eval_initial_from_values(self, vals: List[bool]) -> bool:
-        for val in vals:
-            if val is False:
-                return False
-        # otherwise
+    short_circuit_val = False
 
-        return True
+    def eval_initial_from_values(self, vals: Iterable[bool]) -> bool:
+        return all(val is not False for val in vals)
 
     def eval_js_from_js(self, js_expressions: List[str], delimiter: str) -> str:
         return '&&'.join(js_expressions)
@@ -100,13 +143,10 @@ class AndOperator(BoolComparingOperator):
 ReactiveBinaryOperator.operators['&&'] = AndOperator()
 
 class OrOperator(BoolComparingOperator):
-    def eval_initial_from_values(self, vals: List[bool]) -> bool:
-        for val in vals:
-            if val is True:
-                return True
-        # otherwise
+    short_circuit_val = True
 
-        return False
+    def eval_initial_from_values(self, vals: Iterable[bool]) -> bool:
+        return any(val is True for val in vals)
 
     def eval_js_from_js(self, js_expressions: List[str], delimiter: str) -> str:
         return '||'.join(js_expressions)
@@ -136,14 +176,16 @@ class NumberInequalityOperator(ReactiveBinaryOperator):
     def eval_initial(self, reactive_context: 'ReactContext', args: List['Expression']) -> bool:
         self.validate_args(args)
         
-        vals = [arg.eval_initial(reactive_context) for arg in args]
+        lhs, rhs = args
+        lhs_val = lhs.eval_initial(reactive_context)
+        rhs_val = rhs.eval_initial(reactive_context)
 
-        for i, val in enumerate(vals):
+        for i, val in enumerate((lhs_val, rhs_val)):
             if not isinstance(val, int):
                 raise template.TemplateSyntaxError(f'Error: Argument {i} value isn\'t int in number inequality operator. ' + \
                     f'argument value: {val}, ' + f'argument expression: {args[i]}')
 
-        return self.eval_initial_from_values(vals)
+        return self.eval_initial_from_two_values(lhs_val, rhs_val)
 
 class GreaterOrEqualOperator(NumberInequalityOperator):
     def eval_initial_from_two_values(self, lhs_val: 'ReactValType', rhs_val: 'ReactValType') -> bool:
@@ -175,7 +217,7 @@ class GreaterOperator(NumberInequalityOperator):
 ReactiveBinaryOperator.operators['>'] = GreaterOperator()
 
 class LessOperator(NumberInequalityOperator):
-    def eval_initial_from_value(self, lhs_val: 'ReactValType', rhs_val: 'ReactValType') -> bool:
+    def eval_initial_from_two_values(self, lhs_val: 'ReactValType', rhs_val: 'ReactValType') -> bool:
         return lhs_val < rhs_val
 
     def eval_js_from_two_js(self, lhs_js: str, rhs_js: str, delimiter: str) -> str:
@@ -229,4 +271,8 @@ class DivideOperator(ReactiveBinaryOperator):
     def eval_js_from_js(self, js_expressions: List[str], delimiter: str) -> str:
         return '/'.join(js_expressions)
 
-ReactiveBinaryOperator.operators['/'] = DivideOperator()
\ No newline at end of file
+ReactiveBinaryOperator.operators['/'] = DivideOperator()
+
+# All the operators were registered, so freeze the registry
+ReactiveBinaryOperator.operators = MappingProxyType(dict(ReactiveBinaryOperator.operators))
+ReactiveBinaryOperator.operator_chars = frozenset(''.join(ReactiveBinaryOperator.operators))
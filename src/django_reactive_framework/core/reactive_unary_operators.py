@@ -1,9 +1,10 @@
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
 from .base import ReactContext, ReactValType
 
 class ReactiveUnaryOperator:
-    operators: Dict[str, 'ReactiveUnaryOperator'] = dict()
+    operators: Mapping[str, 'ReactiveUnaryOperator'] = dict()
 
     def validate_arg(self, arg: 'Expression') -> None:
         pass
@@ -56,4 +57,7 @@ class MinusOperator(ReactiveUnaryOperator):
 
 ReactiveUnaryOperator.operators['-'] = MinusOperator()
 
-from .expressions import *
\ No newline at end of file
+# All the operators were registered, so freeze the registry
+ReactiveUnaryOperator.operators = MappingProxyType(dict(ReactiveUnaryOperator.operators))
+
+from .expressions import *
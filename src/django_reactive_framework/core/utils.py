@@ -1,6 +1,9 @@
-from typing import Any, Container, Dict, Iterable, Iterator, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from functools import lru_cache
 
 import itertools
+import re
 
 from django import template
 
@@ -8,10 +11,13 @@ from django import template
 sq = "'"
 dq = '"'
 
+# The translation table is built once per delimiter
+@lru_cache(maxsize=8)
+def str_repr_translation(delimiter: str) -> Dict[int, str]:
+    return str.maketrans({'\\': '\\\\', delimiter: "\\" + delimiter, '\n': '\\n', '\t': '\\t'})
+
 def str_repr(val: Any, delimiter: str):
-    return delimiter + \
-        str(val).translate(str.maketrans({'\\': '\\\\', delimiter: "\\" + delimiter, '\n': '\\n', '\t': '\\t'})) + \
-        delimiter
+    return delimiter + str(val).translate(str_repr_translation(delimiter)) + delimiter
 
 def str_repr_s(val: Any):
     return str_repr(val, sq)
@@ -19,39 +25,38 @@ def str_repr_s(val: Any):
 def str_repr_d(val: Any):
     return str_repr(val, dq)
 
+def string_literal_pattern(delimiter: str) -> re.Pattern:
+    escaped_delimiter = re.escape(delimiter)
+    return re.compile(f'{escaped_delimiter}((?:[^{escaped_delimiter}\\\\]|\\\\.)*){escaped_delimiter}', re.DOTALL)
+
+string_literal_patterns: Dict[str, re.Pattern] = {sq: string_literal_pattern(sq), dq: string_literal_pattern(dq)}
+string_escape_pattern = re.compile(r'\\(.)', re.DOTALL)
+
 def parse_first_string(expression: str, delimiter: str) -> Optional[Tuple[str, int]]:
     """ Return a tupple first substring found and the location to the next character, unless failed and then None. """
     if (not expression) or expression[0] != delimiter:
         return None
     # otherwise
 
-    i = 1
-    output = []
-
-    while i < len(expression):
-        char = expression[i]
-        if char == delimiter:
-            return ''.join(output), (i + 1)
-        elif char == '\\':
-            next_char = expression[i+1]
-            if next_char == delimiter:
-                output.append(delimiter)
-            elif next_char == '\\':
-                output.append('\\')
-            elif next_char == 'n':
-                output.append('\n')
-            elif next_char == 't':
-                output.append('\t')
-            else:
-                return None
+    pattern = string_literal_patterns.get(delimiter)
+    if pattern is None:
+        pattern = string_literal_pattern(delimiter)
 
-            i += 2
-        else:
-            output.append(char)
-            i += 1
-    
-    # otherwise (expression was ended before delimiter)
-    return None
+    match = pattern.match(expression)
+    if match is None:
+        return None# The expression was ended before delimiter
+    # otherwise
+
+    content = match.group(1)
+    if '\\' not in content:
+        return content, match.end()
+    # otherwise
+
+    escapes = {delimiter: delimiter, '\\': '\\', 'n': '\n', 't': '\t'}
+    try:
+        return string_escape_pattern.sub(lambda escape: escapes[escape.group(1)], content), match.end()
+    except KeyError:
+        return None# Unsupported escaping
 
 def parse_string(expression: str, delimiter: str) -> Optional[str]:
     if result := parse_first_string(expression, delimiter):
@@ -69,13 +74,11 @@ common_delimiters = [
     ('"', '"', lambda expression: parse_first_string(expression, '"')),
     ("'", "'", lambda expression: parse_first_string(expression, "'"))]
 
-def match_first(char: str, tuples: List[Tuple]):
-    for t in tuples:
-        if char == t[0]:
-            return t
-    # otherwise
+def delimiters_by_open(delimiters: List[Tuple[str, str, Any]]) -> Dict[str, Tuple[str, str, Any]]:
+    # Reversed, so the first tuple of each beginning delimiter wins
+    return {delimiter[0]: delimiter for delimiter in reversed(delimiters)}
 
-    return None
+common_delimiters_by_open = delimiters_by_open(common_delimiters)
 
 def matching_start(string: str, starts: Iterable[str]):
     for start in starts:
@@ -85,7 +88,31 @@ def matching_start(string: str, starts: Iterable[str]):
 
     return None
 
-def smart_split(expression: str, seperators: Container[str],
+def smart_split(expression: str, seperators: Iterable[str],
+    delimiters: List[Tuple[str, str, Any]] = common_delimiters, skip_blank: bool = True) -> Iterator[str]:
+
+    if delimiters is common_delimiters:
+        # The separators order matters (the first matching one wins), so keep it in the key
+        return iter(smart_split_cached(expression, tuple(seperators), skip_blank))
+    # otherwise
+
+    return smart_split_uncached(expression, seperators, delimiters, skip_blank)
+
+@lru_cache(maxsize=4096)
+def smart_split_cached(expression: str, seperators: Tuple[str, ...], skip_blank: bool) -> Tuple[str, ...]:
+    return tuple(smart_split_uncached(expression, seperators, common_delimiters, skip_blank))
+
+@lru_cache(maxsize=256)
+def characters_pattern(characters: str, any_character: bool = False) -> re.Pattern:
+    """ Return a pattern matching any of the given characters, or any character at all if requested. """
+    if any_character:
+        return re.compile('.', re.DOTALL)
+    elif not characters:
+        return re.compile('(?!)')# Never matches
+    else:
+        return re.compile('[' + re.escape(characters) + ']')
+
+def smart_split_uncached(expression: str, seperators: Iterable[str],
     delimiters: List[Tuple[str, str, Any]] = common_delimiters, skip_blank: bool = True) -> Iterator[str]:
 
     i = 0
@@ -93,6 +120,8 @@ def smart_split(expression: str, seperators: Container[str],
 
     end_delimiters_stack = []
 
+    delimiter_by_open = common_delimiters_by_open if delimiters is common_delimiters else delimiters_by_open(delimiters)
+
     def process_delimiter(tuple, j: int):
         section = expression[j:]
         begin_delimiter, end_delimiter, processor = tuple
@@ -107,20 +136,37 @@ def smart_split(expression: str, seperators: Container[str],
                 assert(0 != result[1])
                 return j + result[1]
 
-    while loc < len(expression):
+    opening_chars = ''.join(delimiter_by_open)
+    top_level_pattern = characters_pattern(''.join(seperator[:1] for seperator in seperators) + opening_chars,
+        any_character=('' in seperators))
+
+    n = len(expression)
+    while loc < n:
+        # Jump directly to the next character which might separate, open or close
+        if not end_delimiters_stack:
+            match = top_level_pattern.search(expression, loc)
+        else:
+            match = characters_pattern(end_delimiters_stack[-1] + opening_chars).search(expression, loc)
+        
+        if match is None:
+            loc = n
+            break
+        # otherwise
+
+        loc = match.start()
         char = expression[loc]
 
-        if len(end_delimiters_stack) == 0:
+        if not end_delimiters_stack:
             if seperator := matching_start(expression[loc:], seperators):
                 if i != loc or (not skip_blank):
                     yield expression[i:loc]
                 i = loc + len(seperator)
-            elif tuple := match_first(char, delimiters):
+            elif tuple := delimiter_by_open.get(char):
                 loc = process_delimiter(tuple, loc) - 1
         else:
             if char == end_delimiters_stack[-1]:
                 end_delimiters_stack.pop()
-            elif tuple := match_first(char, delimiters):
+            elif tuple := delimiter_by_open.get(char):
                 loc = process_delimiter(tuple, loc) - 1
         
         loc += 1
@@ -145,58 +191,65 @@ def split_assignment(assignment: str) -> Optional[Tuple[str, str]]:
     
     return lhs, rhs
 
-def kwargs_stream(aurguments: Iterable[str]) -> Iterator[Optional[str]]:
-    for aurgument in aurguments:
-        if result := split_assignment(aurgument):
-            lhs, rhs = result
-            if lhs:
-                yield lhs
-            
-            yield None
-
-            if rhs:
-                yield rhs
-        else:
-            yield aurgument
-
-def kwargs_stream_reduced(aurguments: Iterable[str]) -> Iterator[Optional[str]]:
-    return (remove_whitespaces_on_boundaries(part) if part is not None else None
-        for part in kwargs_stream(aurguments))
+def split_kwargs(aurguments: Iterable[str]) -> Iterable[Tuple[str, Optional[str]]]:
+    return split_kwargs_cached(tuple(aurguments))
 
+# Only an assignment operator or a string can make an argument need the full scan
+full_scan_chars = frozenset('=\'"')
 
-def split_kwargs(aurguments: Iterable[str]) -> Iterable[Tuple[str, Optional[str]]]:
+@lru_cache(maxsize=4096)
+def split_kwargs_cached(aurguments: Tuple[str, ...]) -> Tuple[Tuple[str, Optional[str]], ...]:
     result: List[Tuple[str, str]] = []
 
     kept_lhs: Optional[str] = None
     saw_assignment_op: bool = False
 
-    for part in kwargs_stream_reduced(aurguments):
-        if part is None:
-            if saw_assignment_op:
-                raise template.TemplateSyntaxError('Founded double assignment (\'= =\')')
-            elif kept_lhs is None:
-                raise template.TemplateSyntaxError('Founded assignment, but nothing is available from lhs for it!')
-            else:
-                saw_assignment_op = True
+    for aurgument in aurguments:
+        # The cheap check avoids the full scan for the common plain argument.
+        # Arguments with quotes are still scanned, for reporting unterminated strings.
+        if not full_scan_chars.isdisjoint(aurgument) and (assignment := split_assignment(aurgument)):
+            lhs, rhs = assignment
+            # None stands for the assignment operator, empty sides are dropped
+            parts = tuple(part for part in (lhs, None, rhs) if part is None or part)
         else:
-            if kept_lhs is None:
-                kept_lhs = part
-            elif saw_assignment_op:
-                result.append((kept_lhs, part))
-                kept_lhs = None
-                saw_assignment_op = False
+            parts = (aurgument,)
+
+        for part in parts:
+            if part is None:
+                if saw_assignment_op:
+                    raise template.TemplateSyntaxError('Founded double assignment (\'= =\')')
+                elif kept_lhs is None:
+                    raise template.TemplateSyntaxError('Founded assignment, but nothing is available from lhs for it!')
+                else:
+                    saw_assignment_op = True
             else:
-                result.append((kept_lhs, None))
-                kept_lhs = part
+                part = remove_whitespaces_on_boundaries(part)
+
+                if kept_lhs is None:
+                    kept_lhs = part
+                elif saw_assignment_op:
+                    result.append((kept_lhs, part))
+                    kept_lhs = None
+                    saw_assignment_op = False
+                else:
+                    result.append((kept_lhs, None))
+                    kept_lhs = part
     
     if saw_assignment_op:
         raise template.TemplateSyntaxError('Founded assignment, but nothing is available from rhs for it!')
     elif kept_lhs is not None:
         result.append((kept_lhs, None))
 
-    return result
+    return tuple(result)
+
+# Above this many parts, a single join is cheaper than concatenating one part at a time
+join_parts_threshold = 8
 
 def manual_non_empty_sum(iter):
+    if type(iter) is list and len(iter) > join_parts_threshold and all(type(element) is str for element in iter):
+        return ''.join(iter)
+    # otherwise
+
     is_first: bool = True
     is_string: bool = False
     for element in iter:
@@ -218,28 +271,17 @@ def manual_non_empty_sum(iter):
     return sum
 
 whitespaces = [' ', '\t', '\n']
+whitespaces_str = ''.join(whitespaces)
 
 def remove_whitespaces_on_boundaries(s: str, left: bool = True, right: bool = True) -> str:
-    i = 0
-    j = len(s) - 1
-
-    if left:
-        for i in range(len(s)):
-            if s[i] not in whitespaces:
-                break
-        
-        if i == len(s) - 1 and s[i] in whitespaces:
-            return ''
-
-    if right:
-        for j in range(len(s) - 1, i - 1, -1):
-            if s[j] not in whitespaces:
-                break
-        
-        if j == 0 and s[0] in whitespaces:
-            return ''
-    
-    return s[i:j+1]
+    if left and right:
+        return s.strip(whitespaces_str)
+    elif left:
+        return s.lstrip(whitespaces_str)
+    elif right:
+        return s.rstrip(whitespaces_str)
+    else:
+        return s
 
 def reduce_nodelist(nodelist: template.NodeList) -> template.NodeList:
     """
@@ -256,17 +298,19 @@ def reduce_nodelist(nodelist: template.NodeList) -> template.NodeList:
             test = remove_whitespaces_on_boundaries(node.s)
             if not test:
                 continue
+        else:
+            # Keep the flag which Django's parser sets on the nodelists it builds
+            new_nodelist.contains_nontext = True
         
         new_nodelist.append(node)
     
     return new_nodelist
 
+iteration_end = object()
+
+# For containers, just use "not container" instead
 def is_iterable_empty(iterable: Iterable) -> bool:
-    for e in iterable:
-        return False
-    # otherwise
-    
-    return True
+    return next(iter(iterable), iteration_end) is iteration_end
 
 def clean_js_execution_expression(js_block: str) -> str:
     return f'( () => {{\n{js_block}\n}} )();'
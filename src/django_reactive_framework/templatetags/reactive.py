@@ -1,5 +1,5 @@
 from os import replace
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import itertools
 from itertools import chain
@@ -8,10 +8,10 @@ from django import template
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 
-from ..core.base import ReactBlockReplaceNode, ReactHook, ReactRerenderableContext, ReactValType, ReactVar, ReactContext, ReactNode, ResorceScript, next_id_by_context, value_to_expression
+from ..core.base import ReactBlockReplaceNode, ReactHook, ReactRerenderableContext, ReactValType, ReactVar, ReactContext, ReactNode, ResorceScript, empty_hooks, next_id_by_context, value_to_expression
 from ..core.expressions import BinaryOperatorExpression, BoolExpression, EscapingContainerExpression, Expression, FunctionCallExpression, IntExpression, NativeVariableExpression, SettableExpression, SettablePropertyExpression, StringExpression, SumExpression, TernaryOperatorExpression, VariableExpression, parse_expression
 from ..core.reactive_function import CustomReactiveFunction
-from ..core.reactive_binary_operators import StrictEqualityOperator
+from ..core.reactive_binary_operators import ReactiveBinaryOperator
 
 from ..core.utils import enumerate_reversed, reduce_nodelist, remove_whitespaces_on_boundaries, split_kwargs, str_repr_s, smart_split, common_delimiters, dq, whitespaces
 
@@ -68,7 +68,7 @@ class ReactDefNode(ReactNode):
 
         def render_js_and_hooks(self, subtree: List) -> Tuple[str, Iterable[ReactHook]]:
             self.act()
-            return '', []
+            return '', empty_hooks
         
         def render_script(self, subtree: Optional[List]) -> ResorceScript:
             self.act()
@@ -208,7 +208,7 @@ class ReactElementNode(ReactNode):
                     f"{str_repr_s('<' + self.html_tag)}+{attribute_str}+'>'+" + \
                         inner_js_expression + f"+{str_repr_s('</' + self.html_tag + '>')}"
             
-            return js_expression, []
+            return js_expression, empty_hooks
         
         def set_attribute_js_expression(self, element_js: str, attribute: str,
             js_cond_exp: Optional[str], js_val_exp: Optional[str]) -> str:
@@ -247,7 +247,7 @@ class ReactElementNode(ReactNode):
             def attribute_js_expressions_and_hooks(expressions: Tuple[Optional[Expression], Optional[Expression]]):
                 cond_expression, val_expression = expressions
 
-                cond_hooks, val_hooks = [], []
+                cond_hooks, val_hooks = empty_hooks, empty_hooks
                 
                 if cond_expression is not None:
                     cond_expression, cond_hooks = cond_expression.eval_js_and_hooks(self)
@@ -273,7 +273,7 @@ class ReactElementNode(ReactNode):
 
             js_rerender_expression, hooks_inside = self.render_js_and_hooks_inside(subtree)
 
-            hooks = set(hooks_inside)
+            hooks = dict.fromkeys(hooks_inside)
 
             control_var = self.make_control_var()
 
@@ -445,7 +445,7 @@ class ReactScriptNode(ReactNode):
             return ''
 
         def render_js_and_hooks(self, subtree: List) -> Tuple[str, Iterable[ReactHook]]:
-            return '', []
+            return '', empty_hooks
         
         def render_script(self, subtree: Optional[List]) -> ResorceScript:
             js_script = self.render_html_inside(subtree)
@@ -732,7 +732,7 @@ class ReactForNode(ReactNode):
             # get all the hooks without iter_var, because that on change the array it's gonna change.
             hooks_inside = filter((iter_var).__ne__, hooks_inside_unfiltered)
             
-            hooks = set(chain(iter_hooks, hooks_inside))
+            hooks = dict.fromkeys(chain(iter_hooks, hooks_inside))
 
             vars = super().vars_needed_decleration()
 
@@ -1060,6 +1060,8 @@ class ReactClauseNode(ReactNode):
 
         return ReactClauseNode.Context(id=id, parent=parent_context, condition=condition)
 
+strict_equality_operator: ReactiveBinaryOperator = ReactiveBinaryOperator.operators['===']
+
 class ReactIfNode(ReactNode):
     tag_name = 'if'
 
@@ -1098,7 +1100,7 @@ class ReactIfNode(ReactNode):
                 return html_outputs[current_cluse]
 
         def render_js_and_hooks(self, subtree: List) -> Tuple[str, Iterable[ReactHook]]:
-            else_js, else_hooks = '\'\'', []
+            else_js, else_hooks = '\'\'', empty_hooks
 
             current_clause = self.make_tracking_var(subtree)
 
@@ -1106,16 +1108,16 @@ class ReactIfNode(ReactNode):
                 context, subsubtree = element
                 context: ReactClauseNode.Context = context
                 else_js, else_hooks = context.render_js_conditional_or_else(subsubtree, else_js, else_hooks,
-                    alias_condition=BinaryOperatorExpression('==',
-                        StrictEqualityOperator(),
+                    alias_condition=BinaryOperatorExpression('===',
+                        strict_equality_operator,
                         [VariableExpression(current_clause.name), IntExpression(i)]
                         ))
             
-            return else_js, []
+            return else_js, empty_hooks
             
         def render_script(self, subtree: Optional[List]) -> ResorceScript:
-            all_hooks: List[Set[ReactHook]] = \
-                [set(context.render_js_and_hooks(subsubtree)[1]) for context, subsubtree in subtree]
+            all_hooks: List[Dict[ReactHook, None]] = \
+                [dict.fromkeys(context.render_js_and_hooks(subsubtree)[1]) for context, subsubtree in subtree]
             self.clear_render()
 
             scripts = [context.render_script(subsubtree) for context, subsubtree in subtree]
@@ -1382,7 +1384,7 @@ class ReactSetNode(ReactNode):
         def render_html(self, subtree: List) -> str:
             if self.val_expression is None:
                 js_expression = self.render_html_inside(subtree)
-                hooks = []
+                hooks = empty_hooks
             else:
                 js_expression, hooks = self.val_expression.eval_js_and_hooks(self)
 
@@ -1526,7 +1528,7 @@ class ReactRedoNode(ReactNode):
             js_expression, hooks = self.render_js_and_hooks_inside(subtree)
 
             return mark_safe(f'( () => {{ function proc() {{ {script} }} \n' + \
-                '\n'.join((hook.js_attach('proc', False) + ';' for hook in set(hooks))) + \
+                '\n'.join((hook.js_attach('proc', False) + ';' for hook in dict.fromkeys(hooks))) + \
                 '\n proc(); } )();')
 
     def __init__(self, nodelist: template.NodeList):